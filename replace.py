@@ -1,19 +1,44 @@
 import nuke
-import nukescripts
 import re
 import os
 import itertools
 import glob
+import fnmatch
+import time
+from collections import deque
+
+try:
+    import re2
+except ImportError:
+    re2 = None
 
 from Qt import QtWidgets, QtCore
 
 from utilities import cui
 
 
+template_field_re = re.compile(r'%\((\w+)\)s')
+camera_node_re = re.compile(r'^\s*Camera\s*\{', re.MULTILINE)
+_run_caches = []
+_parsed_templates = {}
+
+
 class ReplaceCameraException(Exception):
     pass
 
 
+def compilePattern(pattern, flags=0):
+    '''Compile the pattern with re2 if it is installed and supports the
+    pattern, otherwise fall back to re'''
+    if re2 is not None and not flags & ~re.IGNORECASE:
+        try:
+            return re2.compile(
+                    '(?i)' + pattern if flags & re.IGNORECASE else pattern)
+        except Exception:
+            pass
+    return re.compile(pattern, flags)
+
+
 def getBackdrops(nodes=None):
     '''Get all the backdrops from selection or a list of nodes'''
     if nodes is None:
@@ -26,14 +51,21 @@ def getBackdrops(nodes=None):
     return backdropNodes
 
 
+def clearSelection():
+    '''Deselect the selected nodes of the current context only'''
+    for node in nuke.selectedNodes():
+        node.setSelected(False)
+
+
 def iterNodes(stuff):
     '''Create an iterator for one or more nodes'''
-    if isinstance(stuff, nuke.Node):
-        yield stuff
-    elif hasattr(stuff, '__iter__'):
-        for thing in stuff:
-            for node in iterNodes(thing):
-                yield node
+    stack = [stuff]
+    while stack:
+        thing = stack.pop()
+        if isinstance(thing, nuke.Node):
+            yield thing
+        elif hasattr(thing, '__iter__'):
+            stack.extend(reversed(list(thing)))
 
 
 def restore_selection(add_new=True):
@@ -46,17 +78,17 @@ def restore_selection(add_new=True):
             try:
                 new_stuff = func(*args, **kwargs)
             finally:
-                nukescripts.clear_selection_recursive()
-                if add_new:
-                    for new_node in iterNodes(new_stuff):
-                        try:
-                            new_node.setSelected(True)
-                        except AttributeError:
-                            pass
-                for node in selection:
+                clearSelection()
+                nodes = list(iterNodes(new_stuff)) if add_new else []
+                nodes.extend(selection)
+                reselected = set()
+                for node in nodes:
                     try:
+                        if node in reselected:
+                            continue
+                        reselected.add(node)
                         node.setSelected(True)
-                    except ValueError:
+                    except (ValueError, AttributeError):
                         pass
                 return new_stuff
 
@@ -65,37 +97,264 @@ def restore_selection(add_new=True):
     return _decorator
 
 
+def undo_group(name):
+    '''Record everything the function does to the script as a single undo
+    step'''
+    def _decorator(func):
+        def _grouped(*args, **kwargs):
+            nuke.Undo.begin(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                nuke.Undo.end()
+
+        return _grouped
+
+    return _decorator
+
+
+def cached_run(func):
+    '''Share lookup caches between everything called within the function and
+    discard them once it returns'''
+    def _wrapper(*args, **kwargs):
+        _run_caches.append({})
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _run_caches.pop()
+
+    return _wrapper
+
+
+def getRunCache(name):
+    '''Get the named cache of the current cached run, None outside of one'''
+    if _run_caches:
+        return _run_caches[-1].setdefault(name, {})
+
+
+def getBackdropNodes(backdrop):
+    '''Get the nodes within the backdrop, scanning only once per cached run'''
+    return memoize(nuke.getBackdropNodes,
+                   getRunCache('backdrop_nodes'))(backdrop)
+
+
+def classifyNodes(nodes):
+    '''Group nodes by their class, in a single pass over them, leaving out
+    nodes that have been deleted'''
+    classes = {}
+    for node in nodes:
+        try:
+            node_class = node.Class()
+        except ValueError:
+            continue
+        classes.setdefault(node_class, []).append(node)
+    return classes
+
+
+def getBackdropNodesByClass(backdrop):
+    '''Get the nodes within the backdrop grouped by class, querying each
+    class only once per cached run'''
+    return memoize(lambda bd: classifyNodes(getBackdropNodes(bd)),
+                   getRunCache('backdrop_classes'))(backdrop)
+
+
 def findCameraUpstream(node, delete_visited=True):
-    '''Backward breadth first search for camera node'''
-    nodes = [node]
-    while nodes:
-        for node in nodes[:]:
-            nodes.remove(node)
+    '''Backward breadth first search for camera node, the nodes passed on the
+    way are deleted together once the search is over'''
+    nodes = deque([node])
+    visited = set()
+    passed = []
+    try:
+        while nodes:
+            node = nodes.popleft()
             try:
+                if node in visited:
+                    continue
+                visited.add(node)
                 if node.Class() == 'Camera':
                     return node
             except (ValueError, AttributeError):
                 continue
             nodes.extend(node.dependencies())
-            if delete_visited:
+            passed.append(node)
+    finally:
+        if delete_visited:
+            for node in passed:
                 nuke.delete(node)
 
 
 def getOutputs(node):
     '''Get output nodes with their connect input index'''
-    dependents = node.dependent()
+    dependents = node.dependent(nuke.INPUTS | nuke.HIDDEN_INPUTS)
     outputs = []
     for dep in dependents:
-        for inp in range(dep.maxInputs()):
-            if dep.input(inp) == node:
-                outputs.append((dep, inp))
+        inputs = [dep.input(inp) for inp in range(dep.inputs())]
+        outputs.extend(
+                (dep, inp) for inp, upstream in enumerate(inputs)
+                if upstream == node)
     return outputs
 
 
+def memoize(func, cache=None):
+    '''Wrap a single argument function so that its results are remembered in
+    cache'''
+    if cache is None:
+        cache = {}
+
+    def _memoized(arg):
+        if arg not in cache:
+            cache[arg] = func(arg)
+        return cache[arg]
+
+    return _memoized
+
+
+def unique(items):
+    '''Drop repeated items, keeping the first occurrence of each in order'''
+    seen = set()
+    result = []
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            result.append(item)
+    return result
+
+
+def listEntries(path):
+    '''List names within the directory, empty if it cannot be listed'''
+    try:
+        return os.listdir(path)
+    except OSError:
+        return []
+
+
+def getEntryNames(path, listdir=listEntries):
+    '''Get the lower cased names within the directory'''
+    return frozenset(name.lower() for name in listdir(path))
+
+
+def isListedFile(path, names=getEntryNames):
+    '''Check whether path is a file, looking for it in its parent's listing
+    first so that missing siblings need no stat of their own. Names are
+    compared ignoring case and confirmed with a stat, and a directory that
+    could not be listed is left to os.path.isfile'''
+    parent, name = os.path.split(path)
+    entries = names(parent)
+    if entries and name.lower() not in entries:
+        return False
+    return os.path.isfile(path)
+
+
+def parseTemplate(template):
+    '''Split the template into path components, each paired with the fields
+    it fills first and whether it is free of fields altogether'''
+    parsed = []
+    filled = set()
+    for part in template.split(os.sep):
+        keys = []
+        for key in template_field_re.findall(part):
+            if key not in filled and key not in keys:
+                keys.append(key)
+        filled.update(keys)
+        parsed.append((part, tuple(keys), not template_field_re.search(part)))
+    return tuple(parsed)
+
+
+def expandTemplate(template, choices, isdir=os.path.isdir,
+                   isfile=os.path.isfile, listdir=listEntries):
+    '''Fill the template with every combination of choices and yield the
+    resulting files that exist as soon as each is found, skipping a
+    combination as soon as one of its parent directories is found missing.
+    Glob wildcards are matched against the listing of their parent
+    directory'''
+    parts = memoize(parseTemplate, _parsed_templates)(template)
+
+    def _expand(index, prefix, fields):
+        part, keys, literal = parts[index]
+        last = index == len(parts) - 1
+        if literal:
+            filled = [(fields, [part])]
+        else:
+            filled = []
+            for values in itertools.product(*[choices[k] for k in keys]):
+                new_fields = dict(fields)
+                new_fields.update(zip(keys, values))
+                filled.append((new_fields, (part % new_fields).split(os.sep)))
+
+        for new_fields, names in filled:
+            paths = [prefix]
+            for num, name in enumerate(names, 1):
+                final = last and num == len(names)
+                paths = matchPathComponent(
+                        paths, name, isfile if final else isdir,
+                        listdir=listdir, final=final)
+            for path in paths:
+                if last:
+                    yield path
+                else:
+                    for found in _expand(index + 1, path, new_fields):
+                        yield found
+
+    return _expand(0, None, {})
+
+
+def matchPathComponent(prefixes, name, exists, listdir=listEntries,
+                       final=False):
+    '''Append name to each of the prefixes, keeping the paths that exist. A
+    name containing glob wildcards is expanded from the prefix's listing, its
+    matches need no further check unless they are to be descended into. A
+    leading name may carry a drive, whose listing its wildcards are matched
+    against'''
+    paths = []
+    for prefix in prefixes:
+        if not name and prefix:
+            paths.append(prefix)
+            continue
+        drive, pattern = '', name
+        if prefix is None:
+            drive, pattern = os.path.splitdrive(name)
+        listed = glob.has_magic(pattern)
+        if listed:
+            if prefix is None:
+                entries = listdir(drive or os.curdir)
+            elif not os.path.splitdrive(prefix)[1]:
+                entries = listdir(prefix + os.sep)
+            else:
+                entries = listdir(prefix)
+            if not pattern.startswith('.'):
+                entries = [e for e in entries if not e.startswith('.')]
+            candidates = [drive + entry
+                          for entry in fnmatch.filter(entries, pattern)]
+        else:
+            candidates = [name]
+        for candidate in candidates:
+            if prefix is None:
+                path = candidate
+            else:
+                path = os.sep.join([prefix, candidate])
+            if not candidate or (listed and final) or exists(path):
+                paths.append(path)
+    return paths
+
+
+def hasCameraNode(path):
+    '''Check whether the nuke script at path defines a Camera node, without
+    pasting it. Unreadable files are left for nuke to report'''
+    try:
+        with open(path) as script:
+            contents = script.read()
+    except (IOError, OSError):
+        return True
+    return camera_node_re.search(contents) is not None
+
+
 @restore_selection()
+@undo_group('Replace Camera')
 def replaceCamera(camera, path):
     '''Replace camera with one found in the path'''
-    nukescripts.clear_selection_recursive()
+    if not memoize(hasCameraNode, getRunCache('camera_scripts'))(path):
+        return None
+    clearSelection()
     dependent = getOutputs(camera)
     x = camera.xpos()
     y = camera.ypos()
@@ -115,13 +374,24 @@ def replaceCamera(camera, path):
 
 
 class BackdropShot(object):
-    shot_re = re.compile(r'SH(\d+)([a-z]?)', re.IGNORECASE)
-    sequence_re = re.compile(r'SQ(\d+)([a-z]?)', re.IGNORECASE)
-    episode_re = re.compile(r'EP(\d+)([a-z]?)', re.IGNORECASE)
-    episode_re2 = re.compile(r'02_production[\\\/]+([^\\\/]*)')
-    project_re = re.compile('(?<=[\\/])[^\\/]*(?=[\\/]02_production)')
-    char_re = re.compile('char', re.IGNORECASE)
-    beauty_re = re.compile('beauty', re.IGNORECASE)
+    __slots__ = ('episode', 'sequence', 'shot', 'project', 'backdrop',
+                 '_numbers')
+    shot_re = compilePattern(r'SH(\d+)([a-z]?)', re.IGNORECASE)
+    sequence_re = compilePattern(r'SQ(\d+)([a-z]?)', re.IGNORECASE)
+    episode_re = compilePattern(r'EP(\d+)([a-z]?)', re.IGNORECASE)
+    episode_re2 = compilePattern(r'02_production[\\\/]+([^\\\/]*)')
+    project_re = compilePattern('(?<=[\\/])[^\\/]*(?=[\\/]02_production)')
+    separator_re = compilePattern(r'[\\/]+')
+    char_re = compilePattern('char', re.IGNORECASE)
+    beauty_re = compilePattern('beauty', re.IGNORECASE)
+    token_re = compilePattern(
+            r'(?=(?P<shot>SH\d+[a-z]?)|(?P<sequence>SQ\d+[a-z]?)'
+            r'|(?P<episode>EP\d+[a-z]?))', re.IGNORECASE)
+    number_patterns = {'shot': shot_re, 'sequence': sequence_re,
+                       'episode': episode_re}
+    score_patterns = ((shot_re, 'sh'), (sequence_re, 'sq'), (episode_re, 'ep'),
+                      (project_re, '02_production'), (char_re, 'char'),
+                      (beauty_re, 'beauty'))
     bases = ['L:',
              os.path.join('P:', 'external'),
              os.path.join('P:', 'external', '*'),
@@ -143,6 +413,8 @@ class BackdropShot(object):
     project_maps = {
             'Suntop': {'proj_folder': 'Suntop_Season_01'},
             'Suntop_S04': {'proj_folder': 'Suntop_Season_04'}}
+    live_bases_timeout = 30
+    _live_bases = {}
 
     def __init__(self,
                  episode=None,
@@ -155,6 +427,7 @@ class BackdropShot(object):
         self.shot = shot
         self.project = project
         self.backdrop = backdrop
+        self._numbers = {}
 
     def __str__(self):
         return ('BackdropShot(project=%s, episode=%s, sequence=%s, shot=%s,'
@@ -163,11 +436,27 @@ class BackdropShot(object):
 
     __repr__ = __str__
 
+    @classmethod
+    def getLiveBases(cls):
+        '''Get the bases that exist on this workstation, a base with wildcards
+        being live when any directory matches it. Each base is checked again
+        only after live_bases_timeout seconds'''
+        now = time.time()
+        live = []
+        for base in cls.bases:
+            checked, exists = cls._live_bases.get(base, (None, False))
+            if checked is None or now - checked > cls.live_bases_timeout:
+                exists = any(os.path.isdir(path) for path in glob.iglob(base))
+                cls._live_bases[base] = (now, exists)
+            if exists:
+                live.append(base)
+        return live
+
     def _getCameraPaths_exact_method(self):
         '''Construct the path for location where the maya camera exported from
         animation maybe found'''
         templates = self.camera_templates
-        bases = self.bases
+        bases = self.getLiveBases()
 
         projects = [self.project]
         mapped = self.project_maps.get(self.project, {}).get('proj_folder')
@@ -181,37 +470,40 @@ class BackdropShot(object):
                 'ep%02d%s' % (ep_no, ep_let),
                 'ep%03d%s' % (ep_no, ep_let)])
 
-        sequences = ['sq%03d%s' % self.getSequenceNumber()]
-        sequences.extend([
-            '%s_%s' % (ep, seq)
-            for ep, seq in itertools.product(episodes, sequences)])
+        sequence = 'sq%03d%s' % self.getSequenceNumber()
+        sequences = [sequence]
+        sequences.extend([str(ep) + '_' + sequence for ep in episodes])
 
-        shots = ['sh%03d%s' % self.getShotNumber()]
-        shots.extend([
-            '%s_%s' % (sq, sh)
-            for sq, sh in itertools.product(sequences, shots)
-            ])
+        shot = 'sh%03d%s' % self.getShotNumber()
+        shots = [shot]
+        shots.extend([sq + '_' + shot for sq in sequences])
 
         cams = [pat % sh
                 for pat, sh in itertools.product(
                     ['%s_cam.nk', '%s.nk'], shots)]
 
+        choices = {'base': unique(bases), 'project': unique(projects),
+                   'episode': unique(episodes), 'sequence': unique(sequences),
+                   'shot': unique(shots), 'cam': unique(cams)}
+        isdir = memoize(os.path.isdir, getRunCache('isdir'))
+        listdir = memoize(listEntries, getRunCache('listdir'))
+        names = memoize(lambda path: getEntryNames(path, listdir=listdir),
+                        getRunCache('entry_names'))
+        isfile = memoize(lambda path: isListedFile(path, names=names),
+                         getRunCache('isfile'))
+
         paths = []
-        for temp, base, proj, ep, sq, sh, cam in itertools.product(
-                templates, bases, projects, episodes, sequences, shots, cams):
-            path = temp % {
-                    'base': base, 'project': proj, 'episode': ep,
-                    'sequence': sq, 'shot': sh, 'cam': cam}
-            if os.path.isfile(path):
-                paths.append(path)
+        for temp in templates:
+            paths.extend(expandTemplate(
+                temp, choices, isdir=isdir, isfile=isfile, listdir=listdir))
 
-        return paths
+        return unique(paths)
 
     def _getCameraPaths_blob_method(self,
                                     multi_episode=False,
                                     multi_sequence=False):
         templates = self.camera_templates
-        bases = self.bases
+        bases = self.getLiveBases()
 
         projects = [self.project]
         mapped = self.project_maps.get(self.project, {}).get('proj_folder')
@@ -234,27 +526,43 @@ class BackdropShot(object):
         shots = ['*sh%03d%s' % self.getShotNumber()]
         cams = ['*.nk']
 
-        paths = []
-        for temp, base, proj, ep, sq, sh, cam in itertools.product(
-                templates, bases, projects, episodes, sequences, shots, cams):
-            path = temp % {'base': base, 'project': proj, 'episode': ep,
-                           'sequence': sq, 'shot': sh, 'cam': cam}
-            globs = glob.glob(path)
-            paths.extend(globs)
-
-        return paths
+        choices = {'base': unique(bases), 'project': unique(projects),
+                   'episode': unique(episodes), 'sequence': unique(sequences),
+                   'shot': unique(shots), 'cam': unique(cams)}
+        isdir = memoize(os.path.isdir, getRunCache('isdir'))
+        lexists = memoize(os.path.lexists, getRunCache('lexists'))
+        listdir = memoize(listEntries, getRunCache('listdir'))
 
-    getCameraPaths = _getCameraPaths_blob_method
+        paths = []
+        for temp in templates:
+            paths.extend(expandTemplate(
+                temp, choices, isdir=isdir, isfile=lexists, listdir=listdir))
+
+        return unique(paths)
+
+    def getCameraPaths(self, multi_episode=False, multi_sequence=False):
+        '''Find paths where the camera for the shot may be found, searching
+        for each shot only once per cached run'''
+        cache = getRunCache('camera_paths')
+        if cache is None:
+            return self._getCameraPaths_blob_method(
+                    multi_episode=multi_episode, multi_sequence=multi_sequence)
+        key = (type(self), self.project, self.episode, self.sequence,
+               self.shot, multi_episode, multi_sequence)
+        if key not in cache:
+            cache[key] = self._getCameraPaths_blob_method(
+                    multi_episode=multi_episode, multi_sequence=multi_sequence)
+        return list(cache[key])
 
     def getCameras(self):
-        '''Get Cameras found in the backdrop'''
-        cameras = []
-        if self.backdrop:
-            for node in nuke.getBackdropNodes(self.backdrop):
-                if node.Class() == 'Camera':
-                    cameras.append(node)
-        return cameras
-
+        '''Get Cameras found in the backdrop, always scanning afresh as
+        replacing cameras changes what the backdrop holds'''
+        if not self.backdrop:
+            return []
+        return classifyNodes(
+                nuke.getBackdropNodes(self.backdrop)).get('Camera', [])
+
+    @cached_run
     def replaceCameras(self, path=None):
         '''Replace Cameras found in the Backdrop'''
         cameras = self.getCameras()
@@ -275,7 +583,7 @@ class BackdropShot(object):
             raise ReplaceCameraException(
                     'Cannot find camera on path for backdrop %r' % self)
 
-        for cam in self.getCameras():
+        for cam in cameras:
             try:
                 replaceCamera(cam, path)
             except ReplaceCameraException:
@@ -283,19 +591,19 @@ class BackdropShot(object):
                 traceback.print_exc()
 
     def getNumber(self, element='episode'):
-        '''Parsing episode, sequence and shots for numbers'''
-        value = None
-        exp = None
-        try:
-            value = getattr(self, element)
-            exp = getattr(self, '_'.join([element, 're']))
-        except AttributeError:
-            pass
-        if value is not None and exp is not None:
-            match = exp.match(value)
-            if match:
-                return int(match.group(1)), match.group(2)
-        return None, None
+        '''Parsing episode, sequence and shots for numbers, remembering the
+        result for as long as the parsed value stays the same'''
+        value = getattr(self, element, None)
+        key = (element, value)
+        if key not in self._numbers:
+            number = None, None
+            exp = self.number_patterns.get(element)
+            if value is not None and exp is not None:
+                match = exp.match(value)
+                if match:
+                    number = int(match.group(1)), match.group(2)
+            self._numbers[key] = number
+        return self._numbers[key]
 
     def getPathChoice(self, paths):
         dlg = QtWidgets.QDialog(QtWidgets.QApplication.activeWindow())
@@ -317,7 +625,7 @@ class BackdropShot(object):
         edit.setEnabled(False)
         label = QtWidgets.QLabel('Select Cam Path:')
         box = QtWidgets.QComboBox(dlg)
-        box.addItems(paths)
+        box.setModel(QtCore.QStringListModel(paths, box))
         okbtn = QtWidgets.QPushButton('OK')
         cancelbtn = QtWidgets.QPushButton('Cancel')
 
@@ -349,24 +657,25 @@ class BackdropShot(object):
     @classmethod
     def getFromPath(cls, path):
         '''Parse for project, episode, sequence and shot given a path'''
-        project = shot = sequence = episode = None
-        shot_match = cls.shot_re.search(path)
-        sequence_match = cls.sequence_re.search(path)
-        episode = None
-        episode_match = cls.episode_re.search(path)
-        if not episode_match:
+        project = None
+        tokens = {}
+        for match in cls.token_re.finditer(path):
+            tokens.setdefault(match.lastgroup, match.group(match.lastgroup))
+            if len(tokens) == 3:
+                break
+        shot = tokens.get('shot')
+        sequence = tokens.get('sequence')
+        episode = tokens.get('episode')
+        if episode is None:
             episode_match = cls.episode_re2.search(path)
             if episode_match:
                 episode = episode_match.group(1)
-        else:
-            episode = episode_match.group()
-        project_match = cls.project_re.search(path)
-        if sequence_match:
-            sequence = sequence_match.group()
-        if shot_match:
-            shot = shot_match.group()
-        if project_match:
-            project = project_match.group()
+        if '02_production' in path:
+            parts = cls.separator_re.split(path)
+            if '02_production' in parts:
+                index = parts.index('02_production')
+                if index > 1:
+                    project = parts[index - 1]
         if episode and sequence and shot and project:
             return BackdropShot(
                 episode=episode, sequence=sequence, shot=shot, project=project)
@@ -375,37 +684,48 @@ class BackdropShot(object):
     def getPathScore(cls, path):
         '''Get a path score, higher score means more likelihood for being the
         representative path in a backdrop'''
-        score = 0
-        for attr in dir(cls):
-            if attr.endswith('_re'):
-                exp = getattr(cls, attr)
-                for f in exp.findall(path):
-                    score += 10
-        return score
+        lowered = path.lower()
+        return 10 * sum(len(exp.findall(path))
+                        for exp, hint in cls.score_patterns if hint in lowered)
+
+    @classmethod
+    def getReadPathsFromBackdrop(cls, backdrop):
+        '''Get the distinct file paths of the read nodes within the backdrop
+        in node order'''
+        file_paths = []
+        for node in getBackdropNodesByClass(backdrop).get('Read', []):
+            file_path = node.knob('file').getValue()
+            if file_path:
+                file_paths.append(file_path)
+        return unique(file_paths)
 
     @classmethod
     def getPathsFromBackdrop(cls, backdrop):
         '''Get all paths from the read nodes within the backdrop ordered by
         the likelihood of their relevance to shot being composited in the
         backdrop'''
-        paths = dict()
-        for node in nuke.getBackdropNodes(backdrop):
-            if node.Class() == 'Read':
-                file_path = node.knob('file').getValue()
-                if file_path:
-                    paths[file_path] = cls.getPathScore(file_path)
-        return sorted(paths, key=paths.get, reverse=True)
+        scored = [(cls.getPathScore(file_path), file_path)
+                  for file_path in cls.getReadPathsFromBackdrop(backdrop)]
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [file_path for score, file_path in scored]
+
+    @classmethod
+    def getTopPathFromBackdrop(cls, backdrop):
+        '''Get the path from the read nodes within the backdrop most likely to
+        be relevant to the shot, without ordering the rest'''
+        file_paths = cls.getReadPathsFromBackdrop(backdrop)
+        if file_paths:
+            return max(file_paths, key=cls.getPathScore)
 
     @classmethod
     def getFromBackdrop(cls, backdrop):
         '''Get BackdropShot object from the backdrop'''
-        for node in nuke.getBackdropNodes(backdrop):
-            file_paths = cls.getPathsFromBackdrop(backdrop)
-            if file_paths:
-                shot = cls.getFromPath(file_paths[0])
-                if shot:
-                    shot.backdrop = backdrop
-                    return shot
+        file_path = cls.getTopPathFromBackdrop(backdrop)
+        if file_path:
+            shot = cls.getFromPath(file_path)
+            if shot:
+                shot.backdrop = backdrop
+                return shot
 
     @classmethod
     def getFromNodes(cls, nodes=None):
@@ -429,6 +749,7 @@ class BackdropShot(object):
 
 
 @restore_selection()
+@cached_run
 def replaceBackdropCameras(nodes=None):
     '''Given a list or selection of nodes replace all the camera nodes using
     paths detected from read nodes within containing backdrops'''
@@ -459,6 +780,7 @@ def replaceBackdropCameras(nodes=None):
 
         if not path:
             bds.showMissingCameraError()
+            continue
 
         try:
             for cam in cameras:
@@ -0,0 +1,136 @@
+'''Tests for the camera path expansion that stands in for glob, run against a
+virtual Windows tree with ntpath in place of os.path'''
+import os
+import sys
+import types
+import ntpath
+import unittest
+
+# replace.py is written for nuke's interpreter, provide the host modules it
+# imports so that the pure python path handling can be exercised on its own
+for _name in ('nuke', 'nukescripts', 'Qt', 'utilities'):
+    sys.modules.setdefault(_name, types.ModuleType(_name))
+sys.modules['nuke'].Node = getattr(sys.modules['nuke'], 'Node', object)
+sys.modules['Qt'].QtWidgets = sys.modules['Qt'].QtCore = None
+sys.modules['utilities'].cui = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import replace  # noqa: E402
+
+
+def windowsOs(files):
+    '''Build a stand-in for the os module, using ntpath, that sees only the
+    given files and the directories leading to them. A drive relative path is
+    taken relative to the root of its drive'''
+    def key(path):
+        drive, rest = ntpath.splitdrive(path)
+        return drive + '\\' + rest.strip('\\')
+
+    files = set(key(path) for path in files)
+    dirs = {}
+    for path in files:
+        while ntpath.splitdrive(path)[1] != '\\':
+            path, name = ntpath.split(path)
+            dirs.setdefault(key(path), set()).add(name)
+
+    def listdir(path):
+        if key(path) not in dirs:
+            raise OSError(path)
+        return sorted(dirs[key(path)])
+
+    fake_path = types.ModuleType('ntpath')
+    fake_path.__dict__.update(ntpath.__dict__)
+    fake_path.isdir = lambda path: key(path) in dirs
+    fake_path.isfile = lambda path: key(path) in files
+    fake_path.lexists = lambda path: fake_path.isdir(path) or \
+        fake_path.isfile(path)
+
+    fake_os = types.ModuleType('os')
+    fake_os.sep = '\\'
+    fake_os.curdir = '.'
+    fake_os.path = fake_path
+    fake_os.listdir = listdir
+    return fake_os
+
+
+class TestWindowsExpansion(unittest.TestCase):
+    files = [
+        'L:\\show\\Proj\\02_production\\ep01\\sq001_sh010\\animation'
+        '\\camera\\sh010_cam.nk',
+        'L:\\Proj\\02_production\\ep01\\SEQUENCES\\sq001\\SHOTS\\sh010'
+        '\\animation\\camera\\sh010.nk',
+        'P:\\external\\Proj\\02_production\\ep01\\sq001\\sh010'
+        '\\animation\\camera\\ep01_sq001_sh010.nk']
+    # the bases join onto the drives as they do on the workstations
+    found = sorted([
+        'L:show\\Proj\\02_production\\ep01\\sq001_sh010\\animation'
+        '\\camera\\sh010_cam.nk',
+        'L:\\Proj\\02_production\\ep01\\SEQUENCES\\sq001\\SHOTS\\sh010'
+        '\\animation\\camera\\sh010.nk',
+        'P:external\\Proj\\02_production\\ep01\\sq001\\sh010'
+        '\\animation\\camera\\ep01_sq001_sh010.nk'])
+
+    def setUp(self):
+        self.real_os = replace.os
+        self.os = replace.os = windowsOs(self.files)
+        shot_cls = replace.BackdropShot
+        self.saved = dict((name, shot_cls.__dict__[name]) for name in (
+            'bases', 'camera_templates', 'getLiveBases'))
+        shot_cls.bases = [
+            'L:', ntpath.join('P:', 'external'),
+            ntpath.join('P:', 'external', '*'), ntpath.join('L:', '*')]
+        shot_cls.camera_templates = [
+            ntpath.join(*temp.split('/')) for temp in shot_cls.camera_templates]
+        # glob is left alone by the swap, trust every base to be live
+        shot_cls.getLiveBases = classmethod(lambda cls: list(cls.bases))
+
+    def tearDown(self):
+        replace.os = self.real_os
+        for name, value in self.saved.items():
+            setattr(replace.BackdropShot, name, value)
+
+    def expand(self, template, choices):
+        return list(replace.expandTemplate(
+            template, choices, isdir=self.os.path.isdir,
+            isfile=self.os.path.lexists, listdir=replace.listEntries))
+
+    def shot(self):
+        return replace.BackdropShot(
+            episode='ep01', sequence='sq001', shot='sh010', project='Proj')
+
+    def test_drive_wildcard_base(self):
+        self.assertEqual(ntpath.join('L:', '*'), 'L:*')
+        self.assertEqual(
+            self.expand('%(base)s\\%(project)s\\02_production',
+                        {'base': ['L:*'], 'project': ['Proj']}),
+            ['L:show\\Proj\\02_production'])
+
+    def test_drive_root_wildcard(self):
+        self.assertEqual(
+            self.expand('%(base)s\\*\\02_production', {'base': ['L:']}),
+            ['L:\\Proj\\02_production'])
+
+    def test_drive_wildcard_file(self):
+        self.assertEqual(
+            replace.matchPathComponent(
+                [None], 'P:*', self.os.path.lexists,
+                listdir=replace.listEntries, final=True),
+            ['P:external'])
+
+    def test_missing_directory_is_pruned(self):
+        self.assertEqual(
+            self.expand('%(base)s\\%(project)s',
+                        {'base': ['Q:*', 'L:\\missing'], 'project': ['x']}),
+            [])
+
+    def test_blob_method(self):
+        self.assertEqual(
+            sorted(self.shot()._getCameraPaths_blob_method()), self.found)
+
+    def test_exact_method(self):
+        self.assertEqual(
+            sorted(self.shot()._getCameraPaths_exact_method()), self.found)
+
+
+if __name__ == '__main__':
+    unittest.main()